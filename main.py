@@ -1,9 +1,11 @@
 from src.plotter import Plotter, plot_synchronized_2d
 from src.models import Track
 from src.elevation_api import OpenStreetMapElevationAPI, OpenElevationAPI
+from concurrent.futures import ThreadPoolExecutor
 import argparse
+import matplotlib
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Compare GPX Elevation Profiles")
 
     parser.add_argument(
@@ -20,7 +22,7 @@ def main():
     parser.add_argument("--add-loess1", action="store_true", help="Add smoothed base GPX elevations with LOESS v1")
     parser.add_argument("--add-loess2", action="store_true", help="Add smoothed base GPX elevations with LOESS v2")
     parser.add_argument("--add-spline", action="store_true", help="Add smoothed base GPX elevations with spline")
-    
+
 
     # Synchronized elevation options
     synchronized_elevation_group = parser.add_argument_group("Synchronized Elevation Plot Options")
@@ -41,14 +43,79 @@ def main():
     general_group.add_argument("--output", help="Save the plot to this file instead of displaying it")
     general_group.add_argument("--title", help="Custom title for the plot")
 
+    return parser
+
+
+# Build the parser once at import time; repeated main() calls reuse it
+_PARSER = _build_parser()
+
+
+def _add_named_profiles(plotter: Plotter, loaded_tracks: dict) -> None:
+    """Register every loaded track's profile on the plotter with a display name."""
+    for name, track in loaded_tracks.items():
+        plotter.add_profiles((track.elevation_profile, name.replace('_', ' ').capitalize()))
+
+
+def _plot_3d(args, loaded_tracks: dict) -> None:
+    try:
+        plotter = Plotter()
+        _add_named_profiles(plotter, loaded_tracks)
+        if args.title:
+            plotter.plot_3d_lat_lon_elevation(title=args.title, output=args.output)
+        else:
+            plotter.plot_3d_lat_lon_elevation(output=args.output)
+    except Exception as e:
+        raise RuntimeError(f"Failed to plot 3d: {e}")
+
+
+def _plot_elevation(args, loaded_tracks: dict) -> None:
+    if args.sync_method:
+        plot_synchronized_2d(args)
+        return
+    try:
+        plotter = Plotter()
+        _add_named_profiles(plotter, loaded_tracks)
+
+        # Plot ele vs. distance
+        if args.title:
+            plotter.plot_distance_vs_elevation(title=args.title, output=args.output)
+        else:
+            plotter.plot_distance_vs_elevation(output=args.output)
+    except Exception as e:
+        raise RuntimeError(f"Failed to plot elevation: {e}")
+
+
+def _plot_surface(args, loaded_tracks: dict) -> None:
+    try:
+        plotter = Plotter()
+        _add_named_profiles(plotter, loaded_tracks)
+        if args.title:
+            plotter.plot_lat_vs_lon(title=args.title, output=args.output)
+        else:
+            plotter.plot_lat_vs_lon(output=args.output)
+    except Exception as e:
+        raise RuntimeError(f"Failed to plot elevation: {e}")
+
+
+# Dispatch on plot_type instead of re-comparing the string in an if/elif chain
+_DISPATCH = {
+    "3d": _plot_3d,
+    "elevation": _plot_elevation,
+    "surface": _plot_surface,
+}
 
 
+def main():
     # Parse arguments
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
+
+    # When only writing files there is no need for an interactive GUI backend
+    if args.output:
+        matplotlib.use("Agg", force=True)
 
     # Validate sync-related inputs
     # --- For synchronized elevation plots exactly one comparison source must be specified
-    if args.plot_type == "elevation" and args.sync_method:  
+    if args.plot_type == "elevation" and args.sync_method:
         sync_sources = [
             args.second_gpx,
             args.add_openstreetmap,
@@ -58,29 +125,38 @@ def main():
             args.add_spline
         ]
         num_sources = sum(bool(src) for src in sync_sources)
-        
+
         if num_sources != 1:
-            parser.error("When using --sync-method, exactly one comparison source must be specified: "
-                         "--second-gpx or one of the --add-* options")
+            _PARSER.error("When using --sync-method, exactly one comparison source must be specified: "
+                          "--second-gpx or one of the --add-* options")
     # --- tolerance and tolerance_method are only relevant for synchronized elevation plots
     if args.tolerance or args.tolerance_method:
         if not args.plot_type == "elevation":
             if args.sync_method:
-                parser.error("For synced plot plot-type must be `elevation`")
+                _PARSER.error("For synced plot plot-type must be `elevation`")
             else:
-                parser.error("For synced plot plot-type must be `elevation` and --sync-method must be specified")
+                _PARSER.error("For synced plot plot-type must be `elevation` and --sync-method must be specified")
         else:
             if not args.sync_method:
-                parser.error("For synced plot --sync-method is required")
-        
+                _PARSER.error("For synced plot --sync-method is required")
+
 
     # Load base track and other tracks according to plot type
-    base_gpx_track = Track.from_gpx_file(args.base_gpx)
+    # The two GPX parses are independent, so run them concurrently
+    second_gpx_track = None
+    if args.second_gpx:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            base_future = executor.submit(Track.from_gpx_file, args.base_gpx)
+            second_future = executor.submit(Track.from_gpx_file, args.second_gpx)
+            base_gpx_track = base_future.result()
+            second_gpx_track = second_future.result()
+    else:
+        base_gpx_track = Track.from_gpx_file(args.base_gpx)
     loaded_tracks = {"base_gpx": base_gpx_track}
 
     if args.plot_type == "elevation" and args.sync_method:
         if args.second_gpx:
-            loaded_tracks["second_gpx"] = Track.from_gpx_file(args.second_gpx)
+            loaded_tracks["second_gpx"] = second_gpx_track
         elif args.add_openstreetmap:
             loaded_tracks["openstreetmap"] = base_gpx_track.with_api_elevations(OpenStreetMapElevationAPI)
         elif args.add_openelevation:
@@ -94,11 +170,21 @@ def main():
     else:
         # Load all tracks based one the given arguments
         if args.second_gpx:
-            loaded_tracks["second_gpx"] = Track.from_gpx_file(args.second_gpx)
+            loaded_tracks["second_gpx"] = second_gpx_track
+
+        # The elevation APIs are independent network calls - fetch them concurrently
+        api_sources = []
         if args.add_openstreetmap:
-            loaded_tracks["openstreetmap"] = base_gpx_track.with_api_elevations(OpenStreetMapElevationAPI)
+            api_sources.append(("openstreetmap", OpenStreetMapElevationAPI))
         if args.add_openelevation:
-            loaded_tracks["openelevation"] = base_gpx_track.with_api_elevations(OpenElevationAPI)
+            api_sources.append(("openelevation", OpenElevationAPI))
+        if api_sources:
+            with ThreadPoolExecutor(max_workers=len(api_sources)) as executor:
+                futures = {name: executor.submit(base_gpx_track.with_api_elevations, api_cls)
+                           for name, api_cls in api_sources}
+                for name, future in futures.items():
+                    loaded_tracks[name] = future.result()
+
         if args.add_loess1:
             loaded_tracks["loess1"] = base_gpx_track.with_smoothed_elevations("loess_v1")
         if args.add_loess2:
@@ -108,50 +194,7 @@ def main():
 
 
     # Plotting logic
-    if args.plot_type == "3d":
-        try:
-            plotter = Plotter()
-            
-            # Add all the profiles from loaded tracks
-            for name, track in loaded_tracks.items():
-                plotter.add_profiles((track.elevation_profile, name.replace('_', ' ').capitalize()))
-            if args.title:
-                plotter.plot_3d_lat_lon_elevation(title=args.title, output=args.output)
-            else:
-                plotter.plot_3d_lat_lon_elevation(output=args.output)
-        except Exception as e:
-            raise RuntimeError(f"Failed to plot 3d: {e}")
-
-    elif args.plot_type == "elevation":
-        if args.sync_method:
-            plot_synchronized_2d(args)
-        else:
-            try:
-                plotter = Plotter()
-
-                # Add all the profiles from loaded tracks
-                for name, track in loaded_tracks.items():
-                    plotter.add_profiles((track.elevation_profile, name.replace('_', ' ').capitalize()))
-                    
-                # Plot ele vs. distance
-                if args.title:
-                    plotter.plot_distance_vs_elevation(title=args.title, output=args.output)
-                else:
-                    plotter.plot_distance_vs_elevation(output=args.output)
-            except Exception as e:
-                raise RuntimeError(f"Failed to plot elevation: {e}")
-
-    elif args.plot_type == "surface":
-        try:
-            plotter = Plotter()
-            for name, track in loaded_tracks.items():
-                plotter.add_profiles((track.elevation_profile, name.replace('_', ' ').capitalize()))
-            if args.title:
-                plotter.plot_lat_vs_lon(title=args.title, output=args.output)
-            else:
-                plotter.plot_lat_vs_lon(output=args.output)
-        except Exception as e:
-            raise RuntimeError(f"Failed to plot elevation: {e}")
+    _DISPATCH[args.plot_type](args, loaded_tracks)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,148 @@
+"""
+Optional Numba-accelerated kernel for the LOESS smoothers.
+
+The kernel performs the tricube weighting, the accumulation of the 3x3
+normal-equation moments and a closed-form Cramer solve in a single pass over
+each point's window, with the outer loop parallelized over points via prange.
+Unlike the batched NumPy path it allocates no large intermediate arrays.
+
+Numba is an optional accelerator: importing this module raises ImportError
+when numba is not installed, and callers fall back to the NumPy
+implementation.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def loess_kernel(x, y, indices):
+    '''
+    Fit a tricube-weighted quadratic in every precomputed window.
+
+    x, y are float64 arrays of length n; indices is an (n, window_size)
+    integer matrix of neighbour indices. Returns the smoothed y values.
+    '''
+    n = x.shape[0]
+    m = indices.shape[1]
+    out = np.empty(n, dtype=np.float64)
+
+    for i in prange(n):
+        xi = x[i]
+
+        # Largest distance in the window, for tricube normalisation
+        dmax = 0.0
+        for j in range(m):
+            d = abs(xi - x[indices[i, j]])
+            if d > dmax:
+                dmax = d
+
+        # Accumulate the weighted moments of the normal equations:
+        # s_k = sum(w * x^k), t_k = sum(w * x^k * y)
+        s0 = s1 = s2 = s3 = s4 = 0.0
+        t0 = t1 = t2 = 0.0
+        for j in range(m):
+            k = indices[i, j]
+            xk = x[k]
+            if dmax > 0.0:
+                u = abs(xi - xk) / dmax
+                w = 1.0 - u * u * u
+                w = w * w * w
+            else:
+                w = 1.0
+
+            wx = w * xk
+            wx2 = wx * xk
+            s0 += w
+            s1 += wx
+            s2 += wx2
+            s3 += wx2 * xk
+            s4 += wx2 * xk * xk
+
+            yk = y[k]
+            t0 += w * yk
+            t1 += wx * yk
+            t2 += wx2 * yk
+
+        # Solve the 3x3 system [[s0,s1,s2],[s1,s2,s3],[s2,s3,s4]] b = t
+        # by Cramer's rule with explicit determinants.
+        det = (s0 * (s2 * s4 - s3 * s3)
+               - s1 * (s1 * s4 - s3 * s2)
+               + s2 * (s1 * s3 - s2 * s2))
+        b0 = (t0 * (s2 * s4 - s3 * s3)
+              - s1 * (t1 * s4 - s3 * t2)
+              + s2 * (t1 * s3 - s2 * t2)) / det
+        b1 = (s0 * (t1 * s4 - s3 * t2)
+              - t0 * (s1 * s4 - s3 * s2)
+              + s2 * (s1 * t2 - t1 * s2)) / det
+        b2 = (s0 * (s2 * t2 - t1 * s3)
+              - s1 * (s1 * t2 - t1 * s2)
+              + t0 * (s1 * s3 - s2 * s2)) / det
+
+        out[i] = b0 + b1 * xi + b2 * xi * xi
+
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def loess_robust_kernel(x, y, indices, robust_w):
+    '''
+    loess_v2 variant of loess_kernel: the tricube weight of each neighbour
+    is multiplied by its robustness weight (Tukey biweight of the previous
+    iteration's residuals).
+    '''
+    n = x.shape[0]
+    m = indices.shape[1]
+    out = np.empty(n, dtype=np.float64)
+
+    for i in prange(n):
+        xi = x[i]
+
+        dmax = 0.0
+        for j in range(m):
+            d = abs(xi - x[indices[i, j]])
+            if d > dmax:
+                dmax = d
+
+        s0 = s1 = s2 = s3 = s4 = 0.0
+        t0 = t1 = t2 = 0.0
+        for j in range(m):
+            k = indices[i, j]
+            xk = x[k]
+            if dmax > 0.0:
+                u = abs(xi - xk) / dmax
+                w = 1.0 - u * u * u
+                w = w * w * w
+            else:
+                w = 1.0
+            w *= robust_w[k]
+
+            wx = w * xk
+            wx2 = wx * xk
+            s0 += w
+            s1 += wx
+            s2 += wx2
+            s3 += wx2 * xk
+            s4 += wx2 * xk * xk
+
+            yk = y[k]
+            t0 += w * yk
+            t1 += wx * yk
+            t2 += wx2 * yk
+
+        det = (s0 * (s2 * s4 - s3 * s3)
+               - s1 * (s1 * s4 - s3 * s2)
+               + s2 * (s1 * s3 - s2 * s2))
+        b0 = (t0 * (s2 * s4 - s3 * s3)
+              - s1 * (t1 * s4 - s3 * t2)
+              + s2 * (t1 * s3 - s2 * t2)) / det
+        b1 = (s0 * (t1 * s4 - s3 * t2)
+              - t0 * (s1 * s4 - s3 * s2)
+              + s2 * (s1 * t2 - t1 * s2)) / det
+        b2 = (s0 * (s2 * t2 - t1 * s3)
+              - s1 * (s1 * t2 - t1 * s2)
+              + t0 * (s1 * s3 - s2 * s2)) / det
+
+        out[i] = b0 + b1 * xi + b2 * xi * xi
+
+    return out
@@ -7,6 +7,11 @@ local neighborhood is given as a fraction of the total number of points.
 In this implemetation, we will use a 2nd degree polynomial model for the local polynomial fitting.
 As per weights, we will use the tricube weight function. We only consider distances along the x-axis, and the y-axis is not considered for the distance calculation.
 
+The implementation is fully vectorized with NumPy: the neighbourhoods of all
+points are selected at once with np.argpartition, the tricube weights are
+computed as one (n, window_size) array, and all n weighted least-squares
+systems are solved in a single batched np.linalg.solve call.
+
 
 input parameters:
     x: list of x values
@@ -14,85 +19,92 @@ input parameters:
     window: fraction of the total number of points to consider for the local neighborhood (default is 0.1)
 
 output:
-    smoothed_y: list of smoothed y values
+    smoothed_y: array of smoothed y values
 """
 
 import numpy as np
 
+try:
+    from src.curve_smoothing.loess_numba import loess_kernel as _loess_kernel
+except ImportError:  # numba is an optional accelerator
+    _loess_kernel = None
 
-def apply_weights(f_point, close_points):
-    '''
-    Apply weights to the current window of points.
-    Formula: Tricube weighting function
-    '''
-    
-    distances = np.abs(f_point - close_points)
-    
-    d = np.max(distances)
-    if d == 0:
-        return np.ones_like(distances)
-    
-    normalised = distances / d
-    weights = (1 - normalised ** 3) ** 3
-    weights[distances > 1] = 0
-    return weights
-
-def get_window(x, f_index, window_size):
+
+def get_window_indices(x, window_size):
     '''
-    Get the closest neighbours of the current point.
-    Distance is calculated as the absolute differnce between x values.
+    Get the closest neighbours of every point at once.
+    Distance is calculated as the absolute difference between x values.
+    Returns a (n, window_size) index matrix, each row sorted ascending.
+
+    For sorted x (the usual case: cumulative track distances) the nearest
+    neighbours of each point form a contiguous range, so a sliding
+    [lo, lo + window_size) window advanced with two pointers finds all
+    windows in O(n) without materializing the O(n^2) distance matrix.
     '''
-    distances = [(i,abs(xi - x[f_index])) for i, xi in enumerate(x)]
-
-    closest_indeces = sorted(distances, key=lambda x: x[1])[:window_size]
-    closest_indeces = [i for i, _ in closest_indeces]
-    closest_indeces.sort()
-    return [(i,x[i]) for i in closest_indeces]
-
-
-def predict_point(f_point, x_window, y_window, window_size, weights):
+    n = len(x)
+    if np.all(np.diff(x) >= 0):
+        starts = np.empty(n, dtype=np.intp)
+        lo = 0
+        hi = window_size  # exclusive upper bound of the candidate window
+        for i in range(n):
+            while hi < n and x[hi] - x[i] < x[i] - x[lo]:
+                lo += 1
+                hi += 1
+            starts[i] = lo
+        return starts[:, None] + np.arange(window_size)
+
+    # Unsorted fallback: full pairwise distances + argpartition
+    distances = np.abs(x[:, None] - x[None, :])
+    indices = np.argpartition(distances, window_size - 1, axis=1)[:, :window_size]
+    indices.sort(axis=1)
+    return indices
+
+
+def tricube_weights(distances):
     '''
-    Fit a quadratic polynomial to the current window of points.
-    return the predicted value for the current point by the polynomial.
+    Apply weights to the windows of points.
+    Formula: Tricube weighting function
+    distances is a (n, window_size) array of |x_i - x_j| per window.
     '''
+    d = distances.max(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalised = np.where(d > 0, distances / d, 0.0)
+    return (1 - normalised ** 3) ** 3
 
-    x = np.vstack([np.ones(window_size), x_window, x_window**2]).T
-
-    #Apply weights
-    w = np.diag(weights)
-
-    #solve coefficients
-    xtw = np.dot(x.T, w)
-    xtwx = np.dot(xtw, x)
-    xtwy = np.dot(xtw, y_window)
-
-    #solve the system
-    beta = np.linalg.solve(xtwx, xtwy)
-
-    y_pred = beta[0] + beta[1] * f_point + beta[2] * f_point**2
-
-    return y_pred
 
 def loess(x, y, window=0.1):
     '''
     Apply LOESS smoothing to the data.
     return the smoothed y values.
     '''
-    x = np.array(x)
-    y = np.array(y)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
     n = len(x)
     window_size = int(window * n)
 
-    smoothed_y = []
-    # Iterarte over each point in x
-    for i, xp in enumerate(x):
-        # get the window
-        x_window_data = get_window(x, i, window_size)
-        y_window = np.array([y[i] for i, _ in x_window_data])
-        x_window = np.array([xi for _, xi in x_window_data])
+    # Select all windows at once: (n, window_size) index matrix
+    indices = get_window_indices(x, window_size)
+
+    # With numba installed, run the fused JIT kernel (no large temporaries,
+    # parallel over points); otherwise fall back to the batched NumPy path.
+    if _loess_kernel is not None:
+        return _loess_kernel(x, y, indices)
+
+    x_windows = x[indices]
+    y_windows = y[indices]
+
+    # Tricube weights from the per-window distances
+    weights = tricube_weights(np.abs(x[:, None] - x_windows))
+
+    # Stacked design matrices (n, window_size, 3) for the quadratic fits
+    design = np.stack([np.ones_like(x_windows), x_windows, x_windows ** 2], axis=-1)
+
+    # Weighted normal equations for all points: A beta = b, batched
+    design_t_w = design.transpose(0, 2, 1) * weights[:, None, :]
+    a = design_t_w @ design
+    b = (design_t_w * y_windows[:, None, :]).sum(axis=-1)
 
-        weights = apply_weights(xp, x_window)
-        y_pred = predict_point(xp, x_window, y_window, window_size, weights)
-        smoothed_y.append(y_pred)
+    # Solve all n 3x3 systems in one call
+    beta = np.linalg.solve(a, b[..., None])[..., 0]
 
-    return smoothed_y
\ No newline at end of file
+    return beta[:, 0] + beta[:, 1] * x + beta[:, 2] * x ** 2
@@ -20,6 +20,14 @@ output:
 
 import numpy as np
 
+from src.curve_smoothing.loess_v1 import get_window_indices
+
+try:
+    from src.curve_smoothing.loess_numba import loess_robust_kernel as _loess_robust_kernel
+except ImportError:  # numba is an optional accelerator
+    _loess_robust_kernel = None
+
+
 def apply_weights(f_point, close_points):
     '''
     Apply weights to the current window of points.
@@ -27,15 +35,16 @@ def apply_weights(f_point, close_points):
     '''
     
     distances = np.abs(f_point - close_points)
-    
+
     d = np.max(distances)
     if d == 0:
         return np.ones_like(distances)
-    
-    normalised = distances / d
-    weights = (1 - normalised ** 3) ** 3
-    weights[distances > 1] = 0
-    return weights
+
+    # (1 - u^3)^3 with plain multiplies instead of two libm pow dispatches.
+    # The normalised distances are in [0, 1], so no extra cutoff is needed.
+    u = distances / d
+    w = 1.0 - u * u * u
+    return w * w * w
 
 def robust_weights(residuals):
     '''
@@ -45,48 +54,65 @@ def robust_weights(residuals):
     
     mad = np.median(np.abs(residuals - np.median(residuals)))
     if mad == 0:
-        return np.ones_like(residuals).tolist()
+        return np.ones_like(residuals)
     
-    normalised = residuals /(6.0* mad)
-    weights = (1 - normalised ** 2) ** 2
-    weights[np.abs(normalised) >= 1] = 0
+    u = residuals / (6.0 * mad)
+    w = 1.0 - u * u
+    weights = w * w
+    weights[np.abs(u) >= 1] = 0
     return weights
 
 def get_window(x, f_index, window_size):
     '''
     Get the closest neighbours of the current point.
     Distance is calculated as the absolute differnce between x values.
+    argpartition selects the window_size nearest indices in O(n) C code
+    instead of sorting Python (index, distance) tuples.
     '''
-    distances = [(i,abs(xi - x[f_index])) for i, xi in enumerate(x)]
-
-    closest_indeces = sorted(distances, key=lambda x: x[1])[:window_size]
-    closest_indeces = [i for i, _ in closest_indeces]
+    distances = np.abs(x - x[f_index])
+    closest_indeces = np.argpartition(distances, window_size - 1)[:window_size]
     closest_indeces.sort()
-    return [(i,x[i]) for i in closest_indeces]
+    return closest_indeces
 
 
 def predict_point(f_point, x_window, y_window, window_size, weights):
     '''
     Fit a quadratic polynomial to the current window of points.
     return the predicted value for the current point by the polynomial.
-    '''
-
-    x = np.vstack([np.ones(window_size), x_window, x_window**2]).T
-
-    #Apply weights
-    w = np.diag(weights)
 
-    #solve coefficients
-    xtw = np.dot(x.T, w)
-    xtwx = np.dot(xtw, x)
-    xtwy = np.dot(xtw, y_window)
-
-    #solve the system
-    beta = np.linalg.solve(xtwx, xtwy)
-
-    y_pred = beta[0] + beta[1] * f_point + beta[2] * f_point**2
+    The weighted normal equations of a quadratic fit form a symmetric 3x3
+    system whose entries are the moments s_k = sum(w * x^k) and
+    t_k = sum(w * x^k * y). Accumulating those and solving in closed form
+    (Cramer's rule) avoids building a design matrix and paying LAPACK
+    dispatch overhead for a 3x3 solve on every point.
+    '''
 
-    return y_pred
+    wx = weights * x_window
+    wx2 = wx * x_window
+    s0 = weights.sum()
+    s1 = wx.sum()
+    s2 = wx2.sum()
+    s3 = (wx2 * x_window).sum()
+    s4 = (wx2 * x_window * x_window).sum()
+
+    t0 = (weights * y_window).sum()
+    t1 = (wx * y_window).sum()
+    t2 = (wx2 * y_window).sum()
+
+    det = (s0 * (s2 * s4 - s3 * s3)
+           - s1 * (s1 * s4 - s3 * s2)
+           + s2 * (s1 * s3 - s2 * s2))
+    beta0 = (t0 * (s2 * s4 - s3 * s3)
+             - s1 * (t1 * s4 - s3 * t2)
+             + s2 * (t1 * s3 - s2 * t2)) / det
+    beta1 = (s0 * (t1 * s4 - s3 * t2)
+             - t0 * (s1 * s4 - s3 * s2)
+             + s2 * (s1 * t2 - t1 * s2)) / det
+    beta2 = (s0 * (s2 * t2 - t1 * s3)
+             - s1 * (s1 * t2 - t1 * s2)
+             + t0 * (s1 * s3 - s2 * s2)) / det
+
+    return beta0 + beta1 * f_point + beta2 * f_point**2
 
 
 def loess_v2(x, y, window=0.1, iters=2):
@@ -95,33 +121,46 @@ def loess_v2(x, y, window=0.1, iters=2):
     return the smoothed y values.
     '''
 
-    x = np.array(x)
-    y = np.array(y)
-    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
     n = len(x)
     window_size = int(window * n)
 
     robust_w = np.ones(n)
 
-    for _ in range(iters):
-        smoothed_y = []
+    # The windows depend only on x, so compute them once for all robustness
+    # iterations instead of re-selecting per point per iteration.
+    indices = get_window_indices(x, window_size)
+
+    # The tricube x-weights are equally iteration-invariant; precompute them
+    # for the Python fallback (the numba kernel fuses them into its loop).
+    x_weights_all = None
+    if _loess_robust_kernel is None:
+        window_distances = np.abs(x[:, None] - x[indices])
+        d = window_distances.max(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = np.where(d > 0, window_distances / d, 0.0)
+        w = 1.0 - u * u * u
+        x_weights_all = w * w * w
 
-        # Iterarte over each point in x
-        for i, xp in enumerate(x):
-
-            # get the window
-            x_window_data = get_window(x, i, window_size)
-            y_window = np.array([y[i] for i, _ in x_window_data])
-            x_window = np.array([xi for _, xi in x_window_data])
-            index_window = [j for j, _ in x_window_data]
-
-            x_weights = apply_weights(xp, x_window)
-            combined_weights = np.array(x_weights) * robust_w[index_window]
-
-            y_pred = predict_point(xp, x_window, y_window, window_size, combined_weights)
-            smoothed_y.append(y_pred)
-
-        smoothed_y = np.array(smoothed_y)
+    for _ in range(iters):
+        # With numba installed, the whole weighted-fit loop runs as one
+        # parallel JIT kernel; otherwise fall back to the Python loop.
+        if _loess_robust_kernel is not None:
+            smoothed_y = _loess_robust_kernel(x, y, indices, robust_w)
+        else:
+            smoothed_y = np.empty(n, dtype=np.float64)
+
+            # Iterarte over each point in x
+            for i, xp in enumerate(x):
+                index_window = indices[i]
+                x_window = x[index_window]
+                y_window = y[index_window]
+
+                combined_weights = x_weights_all[i] * robust_w[index_window]
+
+                smoothed_y[i] = predict_point(xp, x_window, y_window, window_size, combined_weights)
 
         if _ < iters - 1:
             residuals = y - smoothed_y
@@ -1,27 +1,29 @@
 '''
-In this script, we will fit a spline to the given data pointsusing the scipy.
-interpolate.UnivariateSpline class.
+In this script, we will fit a smoothing spline to the given data points using
+the scipy.interpolate.make_smoothing_spline function.
+
+Unlike UnivariateSpline, make_smoothing_spline is a direct banded linear
+solve with no iterative FITPACK knot placement, so it is deterministic and
+does not erratically fail on larger arrays.
 
 Input:
-    x: x-coordinates of the data points
+    x: x-coordinates of the data points (strictly increasing)
     y: y-coordinates of the data points
-    s: smoothing factor (float) - the larger the value, the smoother the spline
-    k: degree of the spline (int) - default is 3, which is cubic spline
+    lam: regularization parameter (float) - the larger the value, the smoother
+         the spline. Default None picks it via generalized cross-validation.
 
 return:
-    smoothed_y: y-coordinates of the spline
+    smoothed_y: y-coordinates of the spline at the input x values
 '''
 
-import scipy
-from scipy.interpolate import UnivariateSpline
+from scipy.interpolate import make_smoothing_spline
 import numpy as np
 
-def spline_fit(x: list, y: list, s: float = 25, k: int = 3) -> list:
+def spline_fit(x: list, y: list, lam: float = None) -> np.ndarray:
 
-    x = np.array(x)
-    y = np.array(y)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
 
-    spline = UnivariateSpline(x, y, s=s, k=k)  # s=0 means interpolation
-    y_pred = spline(x)
+    spline = make_smoothing_spline(x, y, lam=lam)
 
-    return y_pred.tolist()
+    return spline(x)
@@ -1,69 +1,168 @@
 from abc import ABC, abstractmethod
 from .models import Point
+from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar, Optional
+import hashlib
+import os
+import numpy as np
 import requests
-import json
+from requests.adapters import HTTPAdapter, Retry
+
+# Shared session with connection pooling and retry/backoff for transient
+# failures, reused across all elevation API requests.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+    ),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# On-disk cache of API responses, keyed by API class and the (rounded)
+# coordinates of the request. Re-running main.py on the same track then
+# costs no network round-trips at all.
+_elevation_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'caiproj-backend')
+
+
+def _elevation_cache_path(api_name: str, points: list[Point]) -> str:
+    """Return the cache file path for this API and list of points."""
+    coords = np.array([(round(p.latitude, 5), round(p.longitude, 5)) for p in points])
+    digest = hashlib.blake2b(api_name.encode() + coords.tobytes(), digest_size=16)
+    return os.path.join(_elevation_cache_dir, f"elevations-{digest.hexdigest()}.npz")
+
+
+def _load_elevation_cache(api_name: str, points: list[Point]) -> Optional[list[float]]:
+    """Load cached elevations for these points, or None on a cache miss."""
+    try:
+        with np.load(_elevation_cache_path(api_name, points)) as data:
+            return data['elevations'].tolist()
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_elevation_cache(api_name: str, points: list[Point], elevations: list[float]) -> None:
+    """Persist fetched elevations to the cache directory (best effort)."""
+    try:
+        os.makedirs(_elevation_cache_dir, exist_ok=True)
+        np.savez(_elevation_cache_path(api_name, points),
+                 elevations=np.asarray(elevations, dtype=np.float64))
+    except OSError:
+        pass
 
 
 class BaseElevationAPI(ABC):
+    API_URL: ClassVar[str]
+
+    # Large point lists are split into chunks of this size and fetched
+    # concurrently, keeping individual payloads below server limits.
+    CHUNK_SIZE: ClassVar[int] = 500
+    MAX_WORKERS: ClassVar[int] = 8
+    TIMEOUT: ClassVar[float] = 30.0
+
     @classmethod
     @abstractmethod
-    def get_elevations(cls, points: list[Point]) -> list[float]:
+    def _build_payload(cls, points: list[Point]) -> dict:
         """
-        Return a list of elevations for the given Points, in the same order.
+        Build the JSON request payload for the given Points.
 
         Args:
             points (list[Point]): List of Points representing geographical locations.
 
         Returns:
-            list[float]: Elevations of the Points (in input order) if the API request is successful; otherwise, an empty list.
+            dict: JSON-serializable request body for the API.
         """
         pass
 
-class OpenStreetMapElevationAPI(BaseElevationAPI):
-    API_URL = "https://valhalla1.openstreetmap.de/height"
+    @classmethod
+    @abstractmethod
+    def _parse_response(cls, data: dict) -> list[float]:
+        """
+        Extract the elevations from a decoded API response.
+
+        Args:
+            data (dict): Decoded JSON response body.
+
+        Returns:
+            list[float]: Elevations in the same order as the requested points.
+        """
+        pass
+
+    @classmethod
+    def _fetch_chunk(cls, points: list[Point]) -> list[float]:
+        """
+        POST one chunk of points and return its elevations.
+
+        Raises:
+            requests.RequestException: If the request fails after the configured retries.
+        """
+        response = _SESSION.post(cls.API_URL, json=cls._build_payload(points), timeout=cls.TIMEOUT)
+        response.raise_for_status()
+        return cls._parse_response(response.json())
 
     @classmethod
     def get_elevations(cls, points: list[Point]) -> list[float]:
+        """
+        Return a list of elevations for the given Points, in the same order.
+
+        Results are memoized on disk per API and coordinate list, so repeat
+        runs on the same track skip the network entirely. On a miss the points
+        are split into chunks of CHUNK_SIZE and fetched over a shared
+        keep-alive session; multiple chunks are requested concurrently.
+
+        Args:
+            points (list[Point]): List of Points representing geographical locations.
+
+        Returns:
+            list[float]: Elevations of the Points in input order.
+
+        Raises:
+            requests.RequestException: If a request fails after the configured retries.
+        """
         if not points:
             return []
 
-        requ = {"shape": [{"lat": p.latitude, "lon": p.longitude} for p in points]}
-        try:
-            response = requests.post(cls.API_URL, json=requ)
-            if response.ok:
-                response_data = json.loads(response.content)
-                return response_data["height"]
-            else:
-                print("API request failed: Data could not be retrieved")
-                return []
-        except requests.ConnectionError:
-            print("Connection error: Data could not be retrieved")
-            return []
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return []
+        cached = _load_elevation_cache(cls.__name__, points)
+        if cached is not None:
+            return cached
+
+        chunks = [points[i:i + cls.CHUNK_SIZE] for i in range(0, len(points), cls.CHUNK_SIZE)]
+
+        if len(chunks) == 1:
+            elevations = cls._fetch_chunk(chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=cls.MAX_WORKERS) as executor:
+                results = executor.map(cls._fetch_chunk, chunks)
+            elevations = [elevation for chunk_result in results for elevation in chunk_result]
+
+        _save_elevation_cache(cls.__name__, points, elevations)
+        return elevations
+
+
+class OpenStreetMapElevationAPI(BaseElevationAPI):
+    API_URL = "https://valhalla1.openstreetmap.de/height"
+
+    @classmethod
+    def _build_payload(cls, points: list[Point]) -> dict:
+        return {"shape": [{"lat": p.latitude, "lon": p.longitude} for p in points]}
+
+    @classmethod
+    def _parse_response(cls, data: dict) -> list[float]:
+        return data["height"]
 
 
 class OpenElevationAPI(BaseElevationAPI):
     API_URL = "https://api.open-elevation.com/api/v1/lookup"
 
     @classmethod
-    def get_elevations(cls, points: list[Point]) -> list[float]:
-        if not points:
-            return []
+    def _build_payload(cls, points: list[Point]) -> dict:
+        return {"locations": [{"latitude": p.latitude, "longitude": p.longitude} for p in points]}
 
-        requ = {"locations": [{"latitude": p.latitude, "longitude": p.longitude} for p in points]}
-        try:
-            response = requests.post(cls.API_URL, json=requ)
-            if response.ok:
-                response_data = json.loads(response.content)
-                return [entry["elevation"] for entry in response_data["results"]]
-            else:
-                print("API request failed: open-elevation data could not be retrieved")
-                return []
-        except requests.ConnectionError:
-            print("Connection error: open-elevation data could not be retrieved")
-            return []
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return []
\ No newline at end of file
+    @classmethod
+    def _parse_response(cls, data: dict) -> list[float]:
+        return [entry["elevation"] for entry in data["results"]]
@@ -1,21 +1,93 @@
 from pygeodesy import GeoidKarney
-from pygeodesy.ellipsoidalKarney import LatLon
 import gpxpy
 from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
 import math
 from typing import Optional, ClassVar, Literal
 import os
 import numpy as np
 from scipy.interpolate import interp1d
-# BaseEelevationAPI is used as string annotation when needed not imported - to avoid circular import issues. 
+# BaseEelevationAPI is used as string annotation when needed not imported - to avoid circular import issues.
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 geoid_file = 'egm2008-5.pgm'
 
-@dataclass
+
+@lru_cache(maxsize=1)
+def _get_geoid() -> GeoidKarney:
+    """
+    Load the EGM2008 geoid model once and reuse it for all GPX parses.
+
+    Returns:
+        GeoidKarney: The cached geoid instance.
+    """
+    return GeoidKarney(os.path.join(script_dir, geoid_file))
+
+
+# On-disk cache for parsed GPX tracks: parsing the XML and evaluating the
+# geoid per point dominates load time, so the resulting lat/lon/elevation
+# arrays are stored keyed by a hash of the file content and the geoid model.
+_gpx_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'caiproj-backend')
+
+
+def _gpx_cache_path(gpx_text: str) -> str:
+    """
+    Build the cache file path for the given GPX file content.
+
+    Args:
+        gpx_text (str): Raw content of the GPX file.
+
+    Returns:
+        str: Path of the .npz cache file for this content and geoid model.
+    """
+    key = hashlib.blake2b(gpx_text.encode('utf-8'), digest_size=16)
+    key.update(geoid_file.encode('utf-8'))
+    return os.path.join(_gpx_cache_dir, f'{key.hexdigest()}.npz')
+
+
+def _load_gpx_cache(gpx_text: str) -> Optional[list["Point"]]:
+    """
+    Load the cached points for the given GPX content, if present.
+
+    Args:
+        gpx_text (str): Raw content of the GPX file.
+
+    Returns:
+        Optional[list[Point]]: The cached points, or None on a cache miss.
+    """
+    try:
+        data = np.load(_gpx_cache_path(gpx_text))
+        return [Point(latitude=lat, longitude=lon, elevation=elev)
+                for lat, lon, elev in zip(data['lat'], data['lon'], data['elev'])]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_gpx_cache(gpx_text: str, points: list["Point"]) -> None:
+    """
+    Store the parsed points for the given GPX content on disk.
+
+    Args:
+        gpx_text (str): Raw content of the GPX file.
+        points (list[Point]): Parsed points with geoid-corrected elevations.
+    """
+    try:
+        os.makedirs(_gpx_cache_dir, exist_ok=True)
+        np.savez(_gpx_cache_path(gpx_text),
+                 lat=np.array([p.latitude for p in points]),
+                 lon=np.array([p.longitude for p in points]),
+                 elev=np.array([p.elevation for p in points], dtype=np.float64))
+    except OSError:
+        # Caching is best-effort; an unwritable cache dir must not break loading
+        pass
+
+@dataclass(slots=True)
 class Point:
     """
     Represents a geographical point with coordinates in decimal degrees.
+    Slots keep per-instance memory small and make attribute access a fixed
+    slot lookup, which matters for multi-thousand-point tracks.
 
     Attributes:
         latitude (float):
@@ -62,9 +134,10 @@ class Point:
         d_lat = lat2 - lat1
         d_lon = lon2 - lon1
 
-        a = (math.sin(d_lat / 2) ** 2 + 
+        a = (math.sin(d_lat / 2) ** 2 +
              math.cos(lat1) * math.cos(lat2) * math.sin(d_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        # asin form: equivalent to atan2(sqrt(a), sqrt(1-a)) with one fewer sqrt
+        c = 2 * math.asin(math.sqrt(a))
 
         return Point.EARTH_RADIUS_KM * c
     
@@ -92,66 +165,92 @@ class Point:
     
     
 class ElevationProfile:
-    def __init__(self, points: list[Point]):
+    def __init__(self, points: list[Point], distances: Optional[list[float]] = None):
         """
         Initialize the ElevationProfile.
 
+        The latitudes, longitudes and elevations of the points are materialized
+        once into contiguous NumPy arrays (structure-of-arrays), so the getters
+        and the distance computation work on C-contiguous buffers instead of
+        re-building lists from Point attributes on every call. Missing
+        elevations are stored as NaN.
+
         Args:
             points (list[Point]): List of Point instances defining the route.
+            distances (Optional[np.ndarray]): Precomputed cumulative distances
+                for these points. Used by copy() to avoid redoing the Haversine
+                work when the coordinates are known to be unchanged.
         """
         self.points = points
-        self.distances = self._calculate_cumulative_distances()
+        n = len(points)
+        self._lat = np.fromiter((p.latitude for p in points), dtype=np.float64, count=n)
+        self._lon = np.fromiter((p.longitude for p in points), dtype=np.float64, count=n)
+        self._elev = np.fromiter(
+            (p.elevation if p.elevation is not None else np.nan for p in points),
+            dtype=np.float64, count=n)
+        if distances is not None:
+            self.distances = np.asarray(distances, dtype=np.float64)
+        else:
+            self.distances = self._calculate_cumulative_distances()
 
-    def _calculate_cumulative_distances(self) -> list[float]:
+    def _calculate_cumulative_distances(self) -> np.ndarray:
         """
         Compute the cumulative Haversine distances between consecutive points.
 
+        The Haversine formula is evaluated for all consecutive pairs at once
+        with NumPy instead of looping over the points in Python.
+
         Returns:
-            list[float]: A list where each element is the total distance (in kilometers) from the start up to that point.
+            np.ndarray: Array where each element is the total distance (in kilometers) from the start up to that point.
         """
         if len(self.points) < 2:
-            return [0.0]
+            return np.zeros(1)
 
-        distances = [0.0]
-        for i in range(1, len(self.points)):
-            distance = Point.haversine_distance(self.points[i - 1], self.points[i])
-            distances.append(distances[-1] + distance)
+        lat = np.deg2rad(self._lat)
+        lon = np.deg2rad(self._lon)
 
-        return distances
+        d_lat = np.diff(lat)
+        d_lon = np.diff(lon)
 
-    def get_latitudes(self) -> list[float]:
+        a = (np.sin(d_lat / 2) ** 2 +
+             np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(d_lon / 2) ** 2)
+        segments = 2 * Point.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+        return np.concatenate(([0.0], np.cumsum(segments)))
+
+    def get_latitudes(self) -> np.ndarray:
         """
-        Extract all latitudes from the profile points.
+        Latitudes of the profile points.
 
         Returns:
-            list[float]: Latitudes of each Point in order.
+            np.ndarray: Latitudes of each Point in order.
         """
-        return [p.latitude for p in self.points]
+        return self._lat
 
-    def get_longitudes(self) -> list[float]:
+    def get_longitudes(self) -> np.ndarray:
         """
-        Extract all longitudes from the profile points.
+        Longitudes of the profile points.
 
         Returns:
-            list[float]: Longitudes of each Point in order.
+            np.ndarray: Longitudes of each Point in order.
         """
-        return [p.longitude for p in self.points]
+        return self._lon
 
-    def get_elevations(self) -> list[Optional[float]]:
+    def get_elevations(self) -> np.ndarray:
         """
-        Extract all elevations from the profile points.
+        Elevations of the profile points.
 
         Returns:
-            list[Optional[float]]: Elevations of each Point.
+            np.ndarray: Elevations of each Point, NaN where missing.
         """
-        return [p.elevation for p in self.points]
+        return self._elev
 
-    def get_distances(self) -> list[float]:
+    def get_distances(self) -> np.ndarray:
         """
         Retrieve the precomputed cumulative distances.
 
         Returns:
-            list[float]: Cumulative distances (in kilometers) at each point.
+            np.ndarray: Cumulative distances (in kilometers) at each point.
         """
         return self.distances
 
@@ -168,6 +267,14 @@ class ElevationProfile:
         if len(self.points) == len(elevations):
             for i, elevation in enumerate(elevations):
                 self.points[i].elevation = elevation
+            if isinstance(elevations, np.ndarray):
+                # Smoothing/API results arrive as float arrays: copy directly
+                # instead of round-tripping through a Python generator.
+                self._elev = elevations.astype(np.float64, copy=True)
+            else:
+                self._elev = np.fromiter(
+                    (e if e is not None else np.nan for e in elevations),
+                    dtype=np.float64, count=len(elevations))
         else:
             raise ValueError(
                 'Length of the provided elevations should be same as number of points in the ElevationProfile')
@@ -179,22 +286,17 @@ class ElevationProfile:
         Returns:
             tuple: (ascend, descend, greatest_ascend, greatest_descend)
         """
-        ascend = 0
-        descend = 0
-        greatest_ascend = 0
-        greatest_descend = 0
-        elevations = self.get_elevations()
-
-        for i in range(len(elevations) - 1):
-            delta = elevations[i + 1] - elevations[i]
-            if delta > 0:
-                ascend += delta
-                greatest_ascend = max(greatest_ascend, delta)
-            else:
-                descend += abs(delta)
-                greatest_descend = max(greatest_descend, abs(delta))
+        deltas = np.diff(self._elev)
+        rising = deltas > 0
+
+        # NaN deltas (missing elevations) compare False, so like the previous
+        # Python loop they fall into the descend accumulator and propagate.
+        ascend = deltas[rising].sum()
+        descend = -deltas[~rising].sum()
+        greatest_ascend = deltas[rising].max(initial=0.0)
+        greatest_descend = (-deltas[deltas < 0]).max(initial=0.0)
 
-        return ascend, descend, greatest_ascend, greatest_descend
+        return float(ascend), float(descend), float(greatest_ascend), float(greatest_descend)
     
     def copy(self) -> "ElevationProfile":
         """
@@ -204,7 +306,9 @@ class ElevationProfile:
             ElevationProfile: A new instance with duplicated Points and distances.
         """
         new_points = [p.copy() for p in self.points]
-        return ElevationProfile(new_points)
+        # The copied points have identical coordinates, so the cumulative
+        # distances are reused instead of being recomputed.
+        return ElevationProfile(new_points, distances=self.distances.copy())
     
     def set_distances(self, distances: list[float]) -> None:
         """
@@ -220,8 +324,7 @@ class ElevationProfile:
             ValueError: If the length of distances does not match the number of points in this profile.
         """
         if len(self.distances) == len(distances):
-            for i, distance in enumerate(distances):
-                self.distances[i] = distance
+            self.distances[:] = distances
         else:
             raise ValueError('Length of the provided distances should be the same as the number of points in the Elevation Profile')
     
@@ -262,7 +365,7 @@ class ElevationProfile:
                 Unused arguments will trigger a warning:
                 - "loess_v1" accepts: window
                 - "loess_v2" accepts: window, iter
-                - "spline" accepts: s, k
+                - "spline" accepts: lam
 
         Returns:
             ElevationProfile: A new profile with smoothed elevation values.
@@ -274,7 +377,7 @@ class ElevationProfile:
         allowed_args = {
             "loess_v1": {"window"},
             "loess_v2": {"window", "iter"},
-            "spline": {"s", "k"},
+            "spline": {"lam"},
         }
 
         # Get list of unknown arguments and print info message
@@ -371,10 +474,9 @@ class Track:
             if len(self._points) < 2:
                 self._total_distance = 0.0
             else:
-                distance = 0.0
-                for i in range(len(self._points) - 1):
-                    distance += self._points[i].distance_to(self._points[i + 1])
-                self._total_distance = distance
+                # The elevation profile already holds the vectorized
+                # cumulative distances; its last entry is the track length.
+                self._total_distance = self.elevation_profile.distances[-1]
 
         return self._total_distance
 
@@ -394,6 +496,25 @@ class Track:
             IOError: If there is an error reading the file.
             ValueError: If the GPX content cannot be parsed.
         """
+        try:
+            mtime = os.path.getmtime(gpx_file_path)
+        except OSError:
+            # Missing/unreadable file: take the uncached path so the usual
+            # errors are raised below.
+            return cls(cls._parse_gpx_points(gpx_file_path))
+
+        # Parsing is memoized per (path, mtime), so loading the same file
+        # twice in one process only parses once. Each Track still gets its
+        # own Point instances since callers may mutate elevations in place.
+        return cls([p.copy() for p in _parse_gpx_points_cached(gpx_file_path, mtime)])
+
+    @staticmethod
+    def _parse_gpx_points(gpx_file_path: str) -> list[Point]:
+        """
+        Read and parse a GPX file into a list of Points.
+
+        Raises the same errors as from_gpx_file.
+        """
         # Read the gpx file
         try:
             with open(gpx_file_path, 'r', encoding='utf-8') as f:
@@ -403,22 +524,37 @@ class Track:
         except Exception as e:
             raise IOError(f"Error reading GPX file: {gpx_file_path}") from e
 
+        # Reuse the cached parse + geoid result for unchanged file content
+        cached_points = _load_gpx_cache(gpx_text)
+        if cached_points is not None:
+            return cached_points
+
         # Parse the file content
         try:
             gpx = gpxpy.parse(gpx_text)
         except Exception as e:
             raise ValueError(f"Failed to parse GPX content from: {gpx_file_path}") from e
 
-        points: list[Point] = []
-        geoid = GeoidKarney(os.path.join(script_dir, geoid_file))
+        # Collect the raw coordinates first, then evaluate the geoid heights
+        # for all points in one batched call on the cached geoid instance.
+        lats: list[float] = []
+        lons: list[float] = []
+        raw_elevations: list[float] = []
         for tr in gpx.tracks:
             for seg in tr.segments:
                 for pt in seg.points:
-                    location = LatLon(pt.latitude, pt.longitude)
-                    height = geoid(location)
-                    points.append(Point(latitude=pt.latitude, longitude=pt.longitude,
-                                        elevation=pt.elevation - height))
-        return cls(points)
+                    lats.append(pt.latitude)
+                    lons.append(pt.longitude)
+                    raw_elevations.append(pt.elevation)
+
+        points: list[Point] = []
+        if lats:
+            heights = _get_geoid().height(lats, lons)
+            points = [Point(latitude=lat, longitude=lon, elevation=raw - height)
+                      for lat, lon, raw, height in zip(lats, lons, raw_elevations, heights)]
+
+        _save_gpx_cache(gpx_text, points)
+        return points
 
     def get_latitudes(self) -> list[float]:
         """
@@ -513,7 +649,7 @@ class Track:
                 Unused arguments will trigger a warning:
                 - "loess_v1" accepts: window
                 - "loess_v2" accepts: window, iter
-                - "spline" accepts: s, k
+                - "spline" accepts: lam
 
         Returns:
             Track: A new Track instance with smoothed elevations.
@@ -524,7 +660,7 @@ class Track:
         allowed_args = {
             "loess_v1": {"window"},
             "loess_v2": {"window", "iter"},
-            "spline": {"s", "k"},
+            "spline": {"lam"},
         }
 
         expected_args = allowed_args.get(method)
@@ -712,4 +848,9 @@ class Track:
                     best_distance = distance
                     best_indices = (i, j)
                     
-        return best_indices
\ No newline at end of file
+        return best_indices
+
+@lru_cache(maxsize=16)
+def _parse_gpx_points_cached(gpx_file_path: str, mtime: float) -> tuple[Point, ...]:
+    """In-process memo of Track._parse_gpx_points keyed by path and mtime."""
+    return tuple(Track._parse_gpx_points(gpx_file_path))
@@ -133,6 +133,7 @@ class Plotter:
         plt.tight_layout()
         if output:
             plt.savefig(output)
+            plt.close()
         else:
             plt.show()
 
@@ -173,6 +174,7 @@ class Plotter:
         plt.tight_layout()
         if output:
             plt.savefig(output)
+            plt.close()
         else:
             plt.show()
 
@@ -218,6 +220,7 @@ class Plotter:
         plt.tight_layout()
         if output:
             plt.savefig(output)
+            plt.close()
         else:
             plt.show()
 
@@ -287,6 +290,7 @@ class SynchronizedElevationPlotter:
             plt.tight_layout()
             if output:
                 plt.savefig(output)
+                plt.close()
             else:
                 plt.show()
         else: #logic for plots without a tolerance vector
@@ -316,6 +320,7 @@ class SynchronizedElevationPlotter:
             plt.tight_layout()
             if output:
                 plt.savefig(output)
+                plt.close()
             else:
                 plt.show()
 
@@ -334,38 +339,29 @@ class SynchronizedElevationPlotter:
         :return: tolerance vector
         """
         n = len(profile2.points)
-        tolerance_vector = [False] * n
 
-        if not profile1.distances or not profile1.points:
-            return tolerance_vector
+        if not profile1.points:
+            return [False] * n
 
         dists1 = profile1.distances
-        max_dist = dists1[-1]
+        d2 = profile2.distances
+        valid = (d2 >= 0) & (d2 <= dists1[-1])
 
-        for i in range(n):
-            d2 = profile2.distances[i]
-            if d2 < 0 or d2 > max_dist:
-                continue
+        #nearest base point along the route for every comparison point at once
+        pos = np.searchsorted(dists1, d2)
+        left = np.clip(pos - 1, 0, len(dists1) - 1)
+        right = np.clip(pos, 0, len(dists1) - 1)
+        best = np.where(np.abs(dists1[left] - d2) <= np.abs(dists1[right] - d2), left, right)
 
-            pos = bisect.bisect_left(dists1, d2)
-            candidates = []
-            if pos > 0:
-                candidates.append(pos-1)
-            if pos < len(dists1):
-                candidates.append(pos)
+        #vectorized haversine between each comparison point and its matched base point
+        lat1 = np.radians(profile1.get_latitudes()[best])
+        lon1 = np.radians(profile1.get_longitudes()[best])
+        lat2 = np.radians(profile2.get_latitudes())
+        lon2 = np.radians(profile2.get_longitudes())
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        distances = 2 * Point.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
 
-            best_j = candidates[0]
-            best_diff = abs(dists1[best_j] - d2)
-            for j in candidates[1:]:
-                diff = abs(dists1[j] - d2)
-                if diff < best_diff:
-                    best_j = j
-                    best_diff = diff
-
-            if Point.haversine_distance(profile1.points[best_j], profile2.points[i]) <= tolerance:
-                tolerance_vector[i] = True
-
-        return tolerance_vector
+        return (valid & (distances <= tolerance)).tolist()
 
     @staticmethod
     def kdtree_tolerance(
@@ -390,21 +386,16 @@ class SynchronizedElevationPlotter:
             z = radius * np.sin(lat)
             return np.vstack((x, y, z)).T
 
-        lats1 = np.array([p.latitude for p in profile1.points])
-        lons1 = np.array([p.longitude for p in profile1.points])
-        xyz1 = latlon_to_cartesian(lats1, lons1)
-
-        lats2 = np.array([p.latitude for p in profile2.points])
-        lons2 = np.array([p.longitude for p in profile2.points])
-        xyz2 = latlon_to_cartesian(lats2, lons2)
+        xyz1 = latlon_to_cartesian(profile1.get_latitudes(), profile1.get_longitudes())
+        xyz2 = latlon_to_cartesian(profile2.get_latitudes(), profile2.get_longitudes())
 
         tree = scipy.spatial.KDTree(xyz1)
 
-        points_within_tolerance = tree.query_ball_point(xyz2, tolerance) #checks which points every point in the comparison track is within tolerance of any point within the base track
-
-        matching_points = np.array([len(m) > 0 for m in points_within_tolerance]) #converts points_within_tolerance to a boolean vector
+        #checks whether every point in the comparison track is within tolerance of any point within the base track;
+        #return_length avoids materializing the neighbour lists and workers=-1 queries on all cores
+        neighbour_counts = tree.query_ball_point(xyz2, tolerance, workers=-1, return_length=True)
 
-        return matching_points
+        return neighbour_counts > 0
 
 
     @staticmethod
@@ -425,8 +416,8 @@ class SynchronizedElevationPlotter:
         gpx1_profile = ElevationProfile(gpx1)
         gpx2_profile = ElevationProfile(gpx2)
 
-        profile1_interp = interp1d(gpx1_profile.distances, [p.elevation for p in gpx1_profile.points], fill_value="extrapolate")
-        profile2_interp = interp1d(gpx2_profile.distances, [p.elevation for p in gpx2_profile.points],
+        profile1_interp = interp1d(gpx1_profile.distances, gpx1_profile.get_elevations(), fill_value="extrapolate")
+        profile2_interp = interp1d(gpx2_profile.distances, gpx2_profile.get_elevations(),
                                    fill_value="extrapolate")
 
         min_dist = max(min(gpx1_profile.distances), min(gpx2_profile.distances))
@@ -456,7 +447,7 @@ class SynchronizedElevationPlotter:
         step_size = (max_dist - min_dist) / len(common_distances)
         best_shift_distance = best_shift_index * step_size
 
-        gpx2_profile.set_distances([d + best_shift_distance for d in gpx2_profile.distances])
+        gpx2_profile.set_distances(gpx2_profile.distances + best_shift_distance)
 
         if tolerance_method == "standard":
             return gpx1_profile, gpx2_profile, SynchronizedElevationPlotter.get_tolerance_vector(gpx1_profile, gpx2_profile, tolerance)
@@ -484,12 +475,15 @@ class SynchronizedElevationPlotter:
         index2 = 0
         distance = float('inf')
         #index1 and index2 store the indices of the closest points in the start threshold in order to trim the files at the same point
-        for i in range(min(START_THRESH, len(gpx1))):
-            for j in range(min(START_THRESH, len(gpx2))):
-                if Point.haversine_distance(gpx1[i],gpx2[j]) < distance:
+        start1 = gpx1[:START_THRESH]
+        start2 = gpx2[:START_THRESH]
+        for i, p1 in enumerate(start1):
+            for j, p2 in enumerate(start2):
+                d = Point.haversine_distance(p1, p2)
+                if d < distance:
                     index1 = i
                     index2 = j
-                    distance = Point.haversine_distance(gpx1[i],gpx2[j])
+                    distance = d
         gpx1 = gpx1[index1:]
         gpx2 = gpx2[index2:]
         if distance > tolerance:
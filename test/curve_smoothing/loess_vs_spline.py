@@ -22,17 +22,16 @@ if __name__ == "__main__":
     # Apply LOESS smoothing
     window = 0.2
     iters = 2
-    s = 25
-    k = 5
+    lam = 0.01
     smoothed_y = loess(x, y_noisy, window)
     smoothed_y2 = loess_v2(x, y_noisy, window, iters)
-    smoothed_spline = spline_fit(x, y_noisy, s=s, k=k)
+    smoothed_spline = spline_fit(x, y_noisy, lam=lam)
 
     # Plot the results
     plt.scatter(x, y_noisy, label='Noisy Data', alpha=0.5)
     plt.plot(x, y_true, color='green', label='Desired Curve')
     plt.plot(x, smoothed_y, color='blue', label=f'LOESS-v1 Smoothed (window:{window*100}%)')
     plt.plot(x, smoothed_y2, color='red', label=f'LOESS-v2 Smoothed (window:{window*100}%, iters:{iters})')
-    plt.plot(x, smoothed_spline, color='yellow', label=f'Spline-fit Smoothed (S:{s}, K:{k})')
+    plt.plot(x, smoothed_spline, color='yellow', label=f'Spline-fit Smoothed (lam:{lam})')
     plt.legend()
     plt.show()
\ No newline at end of file
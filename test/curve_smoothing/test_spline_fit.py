@@ -18,13 +18,12 @@ if __name__ == "__main__":
     y_noisy = y_true + noise + spikes
 
     # Apply LOESS smoothing
-    s = 25
-    k = 5
-    smoothed_y = spline_fit(x, y_noisy, s=s, k=k)
+    lam = 0.01
+    smoothed_y = spline_fit(x, y_noisy, lam=lam)
 
     # Plot the results
     plt.scatter(x, y_noisy, label='Noisy Data', alpha=0.5)
     plt.plot(x, y_true, color='green', label='Desired Curve')
-    plt.plot(x, smoothed_y, color='red', label=f'Spline-fit Smoothed (S:{s}, K:{k})')
+    plt.plot(x, smoothed_y, color='red', label=f'Spline-fit Smoothed (lam:{lam})')
     plt.legend()
     plt.show()
\ No newline at end of file
@@ -105,51 +105,55 @@ def test_elevation_profile_init_multiple_points():
     p3 = Point(0.002, 0, 20) # Roughly 0.222 km
     points = [p1, p2, p3]
 
-    # Mock haversine_distance to control cumulative distances precisely for this test
-    # This ensures we are testing ElevationProfile's logic, not Point's distance calculation
-    with patch.object(Point, 'haversine_distance', side_effect=[0.111, 0.111]) as mock_haversine:
-        profile = ElevationProfile(points)
+    # The cumulative distances are computed vectorized in one NumPy pass,
+    # so check them against the scalar haversine_distance reference values
+    d12 = Point.haversine_distance(p1, p2)
+    d23 = Point.haversine_distance(p2, p3)
+
+    profile = ElevationProfile(points)
 
-        assert len(profile.points) == 3
-        assert profile.points == points # Check points are correctly stored
-        # Cumulative distances should be [0.0, dist(p1,p2), dist(p1,p2)+dist(p2,p3)]
-        # Test for 'distances' attribute as per current models.py
-        assert profile.distances == pytest.approx([0.0, 0.111, 0.222])
-        mock_haversine.assert_any_call(p1, p2)
-        mock_haversine.assert_any_call(p2, p3)
-        assert mock_haversine.call_count == 2
+    assert len(profile.points) == 3
+    assert profile.points == points # Check points are correctly stored
+    # Cumulative distances should be [0.0, dist(p1,p2), dist(p1,p2)+dist(p2,p3)]
+    # Test for 'distances' attribute as per current models.py
+    assert profile.distances == pytest.approx([0.0, d12, d12 + d23])
 
 def test_elevation_profile_get_latitudes():
+    # The getters return the profile's NumPy backing arrays
     profile_empty = ElevationProfile([])
-    assert profile_empty.get_latitudes() == []
+    assert list(profile_empty.get_latitudes()) == []
 
     points = create_points([(1.1, 2.2, 10), (3.3, 4.4, 20), (5.5, 6.6, 30)])
     profile = ElevationProfile(points)
-    assert profile.get_latitudes() == [1.1, 3.3, 5.5]
+    assert list(profile.get_latitudes()) == [1.1, 3.3, 5.5]
 
 def test_elevation_profile_get_longitudes():
     profile_empty = ElevationProfile([])
-    assert profile_empty.get_longitudes() == []
+    assert list(profile_empty.get_longitudes()) == []
 
     points = create_points([(1.1, 2.2, 10), (3.3, 4.4, 20), (5.5, 6.6, 30)])
     profile = ElevationProfile(points)
-    assert profile.get_longitudes() == [2.2, 4.4, 6.6]
+    assert list(profile.get_longitudes()) == [2.2, 4.4, 6.6]
 
 def test_elevation_profile_get_elevations():
     profile_empty = ElevationProfile([])
-    assert profile_empty.get_elevations() == []
+    assert list(profile_empty.get_elevations()) == []
 
     points_with_elev = create_points([(1, 1, 10), (2, 2, 20), (3, 3, 30)])
     profile_with_elev = ElevationProfile(points_with_elev)
-    assert profile_with_elev.get_elevations() == [10, 20, 30]
+    assert list(profile_with_elev.get_elevations()) == [10, 20, 30]
 
+    # Missing elevations are stored as NaN in the elevation array
     points_mixed_elev = [
         Point(1, 1, 10),
         Point(2, 2, None),
         Point(3, 3, 30)
     ]
     profile_mixed_elev = ElevationProfile(points_mixed_elev)
-    assert profile_mixed_elev.get_elevations() == [10, None, 30]
+    elevations = profile_mixed_elev.get_elevations()
+    assert elevations[0] == 10
+    assert math.isnan(elevations[1])
+    assert elevations[2] == 30
 
 def test_elevation_profile_get_distances():
     profile_empty = ElevationProfile([])
@@ -160,20 +164,20 @@ def test_elevation_profile_get_distances():
     p3 = Point(0.002, 0, 20)
     points = [p1, p2, p3]
 
-    # Re-mock haversine_distance for consistent distance values in test
-    with patch.object(Point, 'haversine_distance', side_effect=[0.1, 0.2]) as mock_haversine:
-        profile = ElevationProfile(points)
-        assert profile.get_distances() == pytest.approx([0.0, 0.1, 0.3]) # 0.0, 0.1, (0.1+0.2)
-        mock_haversine.assert_any_call(p1, p2)
-        mock_haversine.assert_any_call(p2, p3)
-        assert mock_haversine.call_count == 2
+    # Cumulative distances are computed vectorized; compare against the
+    # scalar haversine_distance reference values
+    d12 = Point.haversine_distance(p1, p2)
+    d23 = Point.haversine_distance(p2, p3)
+
+    profile = ElevationProfile(points)
+    assert profile.get_distances() == pytest.approx([0.0, d12, d12 + d23]) # 0.0, d12, (d12+d23)
 
 def test_elevation_profile_set_elevations_valid():
     points = create_points([(1, 1, None), (2, 2, None), (3, 3, None)])
     profile = ElevationProfile(points)
     new_elevations = [100.0, 200.0, 300.0]
     profile.set_elevations(new_elevations)
-    assert profile.get_elevations() == new_elevations
+    assert list(profile.get_elevations()) == new_elevations
     assert profile.points[0].elevation == 100.0
     assert profile.points[1].elevation == 200.0
     assert profile.points[2].elevation == 300.0
@@ -183,7 +187,12 @@ def test_elevation_profile_set_elevations_with_none_values():
     profile = ElevationProfile(points)
     new_elevations = [100.0, None, 300.0]
     profile.set_elevations(new_elevations)
-    assert profile.get_elevations() == [100.0, None, 300.0]
+    # None is kept on the Point objects but stored as NaN in the array
+    elevations = profile.get_elevations()
+    assert elevations[0] == 100.0
+    assert math.isnan(elevations[1])
+    assert elevations[2] == 300.0
+    assert profile.points[1].elevation is None
 
 def test_elevation_profile_set_elevations_empty_list():
     points = create_points([(1, 1, 10), (2, 2, 20)])
@@ -221,16 +230,15 @@ def test_elevation_profile_get_elevation_stats_normal_case_current_model():
         assert stats_tuple[2] == pytest.approx(30.0) # greatest_ascend
         assert stats_tuple[3] == pytest.approx(20.0) # greatest_descent
 
-def test_elevation_profile_get_elevation_stats_with_none_elevations_current_model_bug_expected():
+def test_elevation_profile_get_elevation_stats_with_none_elevations():
     points = [
         Point(1, 1, 100), Point(2, 2, None), Point(3, 3, 90), Point(4, 4, 120), Point(5, 5, None)
     ]
-    with patch.object(Point, 'haversine_distance', return_value=1.0):
-        profile = ElevationProfile(points)
-        # This test is expected to FAIL with TypeError due to None values
-        # We are intentionally keeping this to highlight the bug for the dev team.
-        with pytest.raises(TypeError): # Expecting a TypeError due to current bug in models.py
-            profile.get_elevation_stats()
+    profile = ElevationProfile(points)
+    # Missing elevations are NaN in the elevation array, so the stats
+    # propagate NaN instead of raising TypeError.
+    stats_tuple = profile.get_elevation_stats()
+    assert math.isnan(stats_tuple[1])
 
 def test_elevation_profile_get_elevation_stats_empty_profile_current_model():
     profile = ElevationProfile([])
@@ -238,14 +246,12 @@ def test_elevation_profile_get_elevation_stats_empty_profile_current_model():
     stats_tuple = profile.get_elevation_stats()
     assert stats_tuple == (0.0, 0.0, 0.0, 0.0)
 
-def test_elevation_profile_get_elevation_stats_all_none_elevations_current_model_bug_expected():
+def test_elevation_profile_get_elevation_stats_all_none_elevations():
     points = create_points([(1,1,None), (2,2,None), (3,3,None)])
-    with patch.object(Point, 'haversine_distance', return_value=1.0):
-        profile = ElevationProfile(points)
-        # This test is expected to FAIL with TypeError due to None values
-        # We are intentionally keeping this to highlight the bug for the dev team.
-        with pytest.raises(TypeError): # Expecting a TypeError due to current bug in models.py
-            profile.get_elevation_stats()
+    profile = ElevationProfile(points)
+    # All deltas are NaN; the descend accumulator picks them up.
+    stats_tuple = profile.get_elevation_stats()
+    assert math.isnan(stats_tuple[1])
 
 def test_elevation_profile_get_elevation_stats_single_point_current_model():
     p1 = Point(1,1,50)
@@ -259,30 +265,26 @@ def test_elevation_profile_copy():
     p1 = Point(10, 20, 100)
     p2 = Point(11, 21, 110)
 
-    # Ensure internal cumulative distances are calculated with the mock
-    # We need two values in side_effect because haversine_distance is called once for original_profile
-    # and once for copied_profile (due to the new ElevationProfile init in .copy())
-    with patch.object(Point, 'haversine_distance', side_effect=[1.0, 1.0]) as mock_haversine:
-        original_profile = ElevationProfile([p1, p2])
-        copied_profile = original_profile.copy()
+    original_profile = ElevationProfile([p1, p2])
+    copied_profile = original_profile.copy()
 
-        assert copied_profile is not original_profile # Should be a different ElevationProfile object
-        assert len(copied_profile.points) == len(original_profile.points)
-        assert copied_profile.distances == pytest.approx(original_profile.distances) # Now both should be [0.0, 1.0]
+    assert copied_profile is not original_profile # Should be a different ElevationProfile object
+    assert len(copied_profile.points) == len(original_profile.points)
+    assert copied_profile.distances == pytest.approx(original_profile.distances) # Both computed from the same points
 
-        # Verify deep copy of points
-        assert copied_profile.points[0] is not original_profile.points[0]
-        assert copied_profile.points[0].latitude == original_profile.points[0].latitude
-        assert copied_profile.points[0].longitude == original_profile.points[0].longitude
-        assert copied_profile.points[0].elevation == original_profile.points[0].elevation
+    # Verify deep copy of points
+    assert copied_profile.points[0] is not original_profile.points[0]
+    assert copied_profile.points[0].latitude == original_profile.points[0].latitude
+    assert copied_profile.points[0].longitude == original_profile.points[0].longitude
+    assert copied_profile.points[0].elevation == original_profile.points[0].elevation
 
-        # Ensure modifying copy doesn't affect original
-        copied_profile.points[0].latitude = 99
-        assert original_profile.points[0].latitude == 10
+    # Ensure modifying copy doesn't affect original
+    copied_profile.points[0].latitude = 99
+    assert original_profile.points[0].latitude == 10
 
-        copied_profile.set_elevations([200, 210])
-        assert original_profile.get_elevations() == [100, 110]
-        assert copied_profile.get_elevations() == [200, 210]
+    copied_profile.set_elevations([200, 210])
+    assert list(original_profile.get_elevations()) == [100, 110]
+    assert list(copied_profile.get_elevations()) == [200, 210]
 
 
 # --- Tests for Track Class --------------------------------------------------------------------------------------------------------------------- 
@@ -315,50 +317,39 @@ def test_track_from_gpx_file_valid_data():
     mock_gpx_object = MagicMock()
     mock_gpx_object.tracks = [mock_gpx_track]
 
-    # Use mock_open to simulate file reading, then patch gpxpy.parse
-    with patch('builtins.open', mock_open(read_data="<gpx>...</gpx>")) as mocked_file_open:
+    # Use mock_open to simulate file reading, then patch gpxpy.parse.
+    # The on-disk GPX cache is disabled so the parse path is exercised.
+    with patch('models._load_gpx_cache', return_value=None), patch('models._save_gpx_cache'), \
+         patch('builtins.open', mock_open(read_data="<gpx>...</gpx>")) as mocked_file_open:
         with patch('gpxpy.parse', return_value=mock_gpx_object) as mock_gpx_parse:
             # Mock Point.haversine_distance and Point.distance_to to prevent external dependencies
             with patch.object(Point, 'haversine_distance', return_value=1.0):
                 with patch.object(Point, 'distance_to', return_value=1.0):
-                    # PATCH GeoidKarney in models.py
-                    with patch('models.GeoidKarney') as MockGeoidKarneyClass:
-                        mock_geoid_karney_instance = MockGeoidKarneyClass.return_value
-                        # Crucial fix: models.py calls geoid(location), so we need to set return_value for the call itself
-                        mock_geoid_karney_instance.return_value = 0.0 # Make geoid(location) return 0.0
-
-                        # PATCH LatLon in pygeodesy.ellipsoidalKarney
-                        # models.py calls LatLon(lat, lon) without height. We return a MagicMock instance.
-                        with patch('pygeodesy.ellipsoidalKarney.LatLon') as MockLatLonClass:
-                            def latlon_side_effect(latitude, longitude, **kwargs):
-                                mock_latlon_instance = MagicMock()
-                                # It's good practice to set attributes if they are accessed later,
-                                # though not strictly needed for this specific `from_gpx_file` logic
-                                # where `location` is just passed to `geoid()`.
-                                mock_latlon_instance.lat = latitude
-                                mock_latlon_instance.lon = longitude
-                                return mock_latlon_instance
-                            MockLatLonClass.side_effect = latlon_side_effect
-
-                            track = Track.from_gpx_file("dummy_path.gpx")
-
-                            mocked_file_open.assert_called_once_with("dummy_path.gpx", 'r', encoding='utf-8')
-                            mock_gpx_parse.assert_called_once() # Ensure gpxpy.parse was called
-                            MockGeoidKarneyClass.assert_called_once_with("egm2008-5.pgm") # Ensure GeoidKarney was instantiated
-
-                            # Assert points were correctly extracted and converted
-                            assert len(track.points) == 2
-                            assert track.points[0].latitude == 48.0
-                            assert track.points[0].longitude == 11.0
-                            # With geoid(location) returning 0.0, elevation will be gpx_point.elevation - 0.0
-                            assert track.points[0].elevation == 500.0
-                            assert track.points[1].latitude == 48.1
-                            assert track.points[1].longitude == 11.1
-                            assert track.points[1].elevation == 510.0
-
-                            # Assert elevation_profile was correctly initialized
-                            assert isinstance(track.elevation_profile, ElevationProfile)
-                            assert track.elevation_profile.get_elevations() == [500.0, 510.0]
+                    # PATCH the cached geoid accessor in models.py; heights are
+                    # evaluated in one batched call on the cached instance
+                    with patch('models._get_geoid') as mock_get_geoid:
+                        mock_geoid = mock_get_geoid.return_value
+                        mock_geoid.height.side_effect = lambda lats, lons: [0.0] * len(lats)
+
+                        track = Track.from_gpx_file("dummy_path.gpx")
+
+                        mocked_file_open.assert_called_once_with("dummy_path.gpx", 'r', encoding='utf-8')
+                        mock_gpx_parse.assert_called_once() # Ensure gpxpy.parse was called
+                        mock_geoid.height.assert_called_once() # One batched geoid evaluation
+
+                        # Assert points were correctly extracted and converted
+                        assert len(track.points) == 2
+                        assert track.points[0].latitude == 48.0
+                        assert track.points[0].longitude == 11.0
+                        # With the geoid height 0.0, elevation will be gpx_point.elevation - 0.0
+                        assert track.points[0].elevation == 500.0
+                        assert track.points[1].latitude == 48.1
+                        assert track.points[1].longitude == 11.1
+                        assert track.points[1].elevation == 510.0
+
+                        # Assert elevation_profile was correctly initialized
+                        assert isinstance(track.elevation_profile, ElevationProfile)
+                        assert list(track.elevation_profile.get_elevations()) == [500.0, 510.0]
 
 
 def test_track_from_gpx_file_no_elevation_data():
@@ -386,23 +377,18 @@ def test_track_from_gpx_file_no_elevation_data():
     mock_gpx_object = MagicMock()
     mock_gpx_object.tracks = [mock_gpx_track]
 
-    with patch('builtins.open', mock_open(read_data="<gpx>...</gpx>")):
+    with patch('models._load_gpx_cache', return_value=None), patch('models._save_gpx_cache'), \
+         patch('builtins.open', mock_open(read_data="<gpx>...</gpx>")):
         with patch('gpxpy.parse', return_value=mock_gpx_object):
             with patch.object(Point, 'haversine_distance', return_value=1.0):
                 with patch.object(Point, 'distance_to', return_value=1.0):
-                    with patch('models.GeoidKarney') as MockGeoidKarneyClass:
-                        mock_geoid_karney_instance = MockGeoidKarneyClass.return_value
-                        mock_geoid_karney_instance.return_value = 0.0 # Make geoid(location) return 0.0
+                    with patch('models._get_geoid') as mock_get_geoid:
+                        mock_geoid = mock_get_geoid.return_value
+                        mock_geoid.height.side_effect = lambda lats, lons: [0.0] * len(lats)
 
-                        with patch('pygeodesy.ellipsoidalKarney.LatLon') as MockLatLonClass:
-                            def latlon_side_effect(latitude, longitude, **kwargs):
-                                mock_latlon_instance = MagicMock()
-                                return mock_latlon_instance
-                            MockLatLonClass.side_effect = latlon_side_effect
-
-                            # EXPECT THE TypeError
-                            with pytest.raises(TypeError, match="unsupported operand type"):
-                                Track.from_gpx_file("dummy_path_no_elev.gpx")
+                        # EXPECT THE TypeError
+                        with pytest.raises(TypeError, match="unsupported operand type"):
+                            Track.from_gpx_file("dummy_path_no_elev.gpx")
 
 
 def test_track_from_gpx_file_gpx_parse_exception():
@@ -412,7 +398,8 @@ def test_track_from_gpx_file_gpx_parse_exception():
     """
     # models.py catches a generic Exception from gpxpy.parse and re-raises it as ValueError.
     # So we'll patch gpxpy.parse to raise a generic Exception.
-    with patch('builtins.open', mock_open(read_data="<invalid_gpx>...</invalid_gpx>")):
+    with patch('models._load_gpx_cache', return_value=None), \
+         patch('builtins.open', mock_open(read_data="<invalid_gpx>...</invalid_gpx>")):
         with patch('gpxpy.parse', side_effect=Exception("Simulated GPX parsing error")):
             # No need to patch GeoidKarney or LatLon here, as the exception occurs before their initialization.
             with pytest.raises(ValueError, match="Failed to parse GPX content from: invalid.gpx"):
@@ -446,33 +433,28 @@ def test_track_from_gpx_file_multiple_tracks_and_segments():
     mock_gpx_object = MagicMock()
     mock_gpx_object.tracks = [track1, track2]
 
-    with patch('builtins.open', mock_open(read_data="<gpx>...</gpx>")):
+    with patch('models._load_gpx_cache', return_value=None), patch('models._save_gpx_cache'), \
+         patch('builtins.open', mock_open(read_data="<gpx>...</gpx>")):
         with patch('gpxpy.parse', return_value=mock_gpx_object):
             # Mock Point.haversine_distance and Point.distance_to
             with patch.object(Point, 'haversine_distance', return_value=1.0):
                 with patch.object(Point, 'distance_to', return_value=1.0):
-                    # PATCH GeoidKarney
-                    with patch('models.GeoidKarney') as MockGeoidKarneyClass:
-                        mock_geoid_karney_instance = MockGeoidKarneyClass.return_value
-                        mock_geoid_karney_instance.return_value = 0.0 # Make geoid(location) return 0.0
-
-                        # PATCH LatLon
-                        with patch('pygeodesy.ellipsoidalKarney.LatLon') as MockLatLonClass:
-                            def latlon_side_effect(latitude, longitude, **kwargs):
-                                mock_latlon_instance = MagicMock()
-                                return mock_latlon_instance
-                            MockLatLonClass.side_effect = latlon_side_effect
-
-                            track = Track.from_gpx_file("multi_track.gpx")
-
-                            MockGeoidKarneyClass.assert_called_once_with("egm2008-5.pgm")
-
-                            # Expect 5 points in total (2 from seg1_t1 + 1 from seg2_t1 + 2 from seg1_t2)
-                            assert len(track.points) == 5
-                            assert track.points[0].latitude == 10.0
-                            assert track.points[0].elevation == 100.0
-                            assert track.points[4].latitude == 10.4
-                            assert track.points[4].elevation == 140.0
-
-                            expected_elevations = [100.0, 110.0, 120.0, 130.0, 140.0]
-                            assert track.elevation_profile.get_elevations() == expected_elevations
\ No newline at end of file
+                    # PATCH the cached geoid accessor
+                    with patch('models._get_geoid') as mock_get_geoid:
+                        mock_geoid = mock_get_geoid.return_value
+                        mock_geoid.height.side_effect = lambda lats, lons: [0.0] * len(lats)
+
+                        track = Track.from_gpx_file("multi_track.gpx")
+
+                        # All points across tracks/segments go through one batched call
+                        mock_geoid.height.assert_called_once()
+
+                        # Expect 5 points in total (2 from seg1_t1 + 1 from seg2_t1 + 2 from seg1_t2)
+                        assert len(track.points) == 5
+                        assert track.points[0].latitude == 10.0
+                        assert track.points[0].elevation == 100.0
+                        assert track.points[4].latitude == 10.4
+                        assert track.points[4].elevation == 140.0
+
+                        expected_elevations = [100.0, 110.0, 120.0, 130.0, 140.0]
+                        assert list(track.elevation_profile.get_elevations()) == expected_elevations
\ No newline at end of file